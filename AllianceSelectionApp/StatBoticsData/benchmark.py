@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from matchstore import MATCH_DTYPE, load_matches
+from ratingstate import RatingCheckpoint
+from statboticsdata import FRCRatingSystem
+
+# Which way is better for each metric when comparing against a baseline
+HIGHER_IS_BETTER = {
+    'replay_matches_per_s',
+    'update_matches_per_s',
+    'predict_per_s',
+    'batch_predict_per_s'
+}
+
+def generate_event(team_count, match_count, seed=0):
+    # Seeded schedule in the shape of match_data: every round is a shuffle of
+    # all teams cut into alliances, so teams play about equally often.
+    # Scores come from hidden team strengths plus noise
+    if team_count < 6:
+        raise ValueError("An event needs at least 6 teams to fill a match")
+    rng = np.random.default_rng(seed)
+    teams = rng.choice(np.arange(1, 10000), size=team_count, replace=False)
+    strength = rng.normal(20, 8, team_count)
+    per_round = team_count // 6
+    rounds = -(-match_count // per_round)
+
+    order = np.concatenate([rng.permutation(team_count)[:per_round * 6] for _ in range(rounds)])
+    slots = order[:match_count * 6].reshape(match_count, 2, 3)
+    scores = strength[slots].sum(axis=-1) + rng.normal(0, 15, (match_count, 2))
+
+    matches = np.empty(match_count, dtype=MATCH_DTYPE)
+    matches['match_number'] = np.arange(1, match_count + 1)
+    matches['red_alliance'] = teams[slots[:, 0]]
+    matches['blue_alliance'] = teams[slots[:, 1]]
+    matches['red_score'] = np.maximum(scores[:, 0], 0).round()
+    matches['blue_score'] = np.maximum(scores[:, 1], 0).round()
+    return matches
+
+def write_matches(path, matches):
+    columns = zip(
+        matches['match_number'].tolist(),
+        matches['red_alliance'].tolist(),
+        matches['blue_alliance'].tolist(),
+        matches['red_score'].tolist(),
+        matches['blue_score'].tolist()
+    )
+    with open(path, 'w') as f:
+        for match_number, red_alliance, blue_alliance, red_score, blue_score in columns:
+            f.write(json.dumps({
+                'match_number': match_number,
+                'red_alliance': red_alliance,
+                'blue_alliance': blue_alliance,
+                'red_score': red_score,
+                'blue_score': blue_score
+            }) + '\n')
+
+def _percentiles(samples_ns):
+    p50, p95, p99 = np.percentile(samples_ns, [50, 95, 99]) / 1000
+    return {'p50_us': float(p50), 'p95_us': float(p95), 'p99_us': float(p99)}
+
+def _seconds_per_call(function):
+    # Loops the call until a batch runs for at least 0.2s so short
+    # operations are well above timer resolution
+    number, elapsed = timeit.Timer(function).autorange()
+    return elapsed / number
+
+def _latencies(function, red, blue):
+    samples = np.empty(len(red), dtype=np.int64)
+    for i, (red_alliance, blue_alliance) in enumerate(zip(red, blue)):
+        start = time.perf_counter_ns()
+        function(red_alliance, blue_alliance)
+        samples[i] = time.perf_counter_ns() - start
+    return len(samples) / (samples.sum() / 1e9), _percentiles(samples)
+
+def _run_pass(matches_path, match_count, predict_count, directory):
+    results = {}
+
+    # Text ingestion, then the memory-mapped cache once it has been written
+    results['ingest_s'] = _seconds_per_call(lambda: load_matches(matches_path, use_cache=False))
+    matches = load_matches(matches_path)
+    results['cached_load_s'] = _seconds_per_call(lambda: load_matches(matches_path))
+
+    # The replay loop from main(), minus the printing: every match goes
+    # through the checkpoint, so match log appends and the periodic
+    # snapshots are counted, starting from no saved state
+    snapshot_path = os.path.join(directory, 'team_ratings.json')
+    log_path = os.path.join(directory, 'team_ratings.log')
+    for path in (snapshot_path, log_path):
+        if os.path.exists(path):
+            os.remove(path)
+    rating_system = FRCRatingSystem(k_factor=32)
+    checkpoint = RatingCheckpoint(rating_system, snapshot_path, log_path)
+    columns = list(zip(
+        matches['match_number'].tolist(),
+        matches['red_alliance'].tolist(),
+        matches['blue_alliance'].tolist(),
+        matches['red_score'].tolist(),
+        matches['blue_score'].tolist()
+    ))
+    start = time.perf_counter()
+    for match_number, red_alliance, blue_alliance, red_score, blue_score in columns:
+        checkpoint.apply(match_number, red_alliance, blue_alliance, red_score, blue_score)
+    checkpoint.close()
+    results['replay_matches_per_s'] = match_count / (time.perf_counter() - start)
+
+    # update_elo on its own, with per-call latency
+    red = matches['red_alliance'][:predict_count].tolist()
+    blue = matches['blue_alliance'][:predict_count].tolist()
+    per_s, percentiles = _latencies(lambda red_alliance, blue_alliance: rating_system.update_elo(red_alliance, blue_alliance, 10), red, blue)
+    results['update_matches_per_s'] = per_s
+    results.update({f'update_{name}': value for name, value in percentiles.items()})
+
+    per_s, percentiles = _latencies(rating_system.predict_match, red, blue)
+    results['predict_per_s'] = per_s
+    results.update({f'predict_{name}': value for name, value in percentiles.items()})
+
+    alliances = np.stack([matches['red_alliance'], matches['blue_alliance']], axis=1)
+    results['batch_predict_per_s'] = len(alliances) / _seconds_per_call(lambda: rating_system.predict_matches(alliances))
+
+    # team_ratings.json snapshot round trip, with every replayed match
+    # recorded as applied
+    results['json_save_s'] = _seconds_per_call(checkpoint.compact)
+    checkpoint.close()
+    results['json_load_s'] = _seconds_per_call(
+        lambda: RatingCheckpoint(FRCRatingSystem(k_factor=32), snapshot_path, log_path).load()
+    )
+    return results
+
+def run_benchmarks(team_count, match_count, predict_count=100000, seed=0, repeat=5):
+    matches = generate_event(team_count, match_count, seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        matches_path = os.path.join(directory, 'matches.jsonl')
+        write_matches(matches_path, matches)
+
+        # Whole passes are repeated rather than each measurement back to
+        # back, so a slow stretch on the machine can't skew one metric.
+        # Every metric keeps its best pass
+        passes = [_run_pass(matches_path, match_count, predict_count, directory) for _ in range(repeat)]
+        results = {}
+        for name in passes[0]:
+            values = [run[name] for run in passes]
+            results[name] = max(values) if name in HIGHER_IS_BETTER else min(values)
+
+        # Peak memory is the same every time; it gets its own run since
+        # tracing slows everything down
+        tracemalloc.start()
+        load_matches(matches_path, use_cache=False)
+        results['ingest_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return results
+
+def compare(results, baseline, tolerance):
+    # Returns the metrics that got worse than baseline by more than tolerance
+    regressions = []
+    for name, base in baseline['results'].items():
+        if name not in results or not base:
+            continue
+        if name in HIGHER_IS_BETTER:
+            change = (base - results[name]) / base
+        else:
+            change = (results[name] - base) / base
+        if change > tolerance:
+            regressions.append((name, base, results[name], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the rating pipeline on a synthetic event')
+    parser.add_argument('--teams', type=int, default=1000)
+    parser.add_argument('--matches', type=int, default=50000)
+    parser.add_argument('--predictions', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='passes per measurement; the best is kept')
+    parser.add_argument('--write', help='only write the synthetic event as JSONL to this path')
+    parser.add_argument('--save-baseline', help='record the results to this JSON file')
+    parser.add_argument('--compare', help='fail if results regress from this baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+    if args.teams < 6:
+        parser.error("--teams must be at least 6 to fill a match")
+    if args.matches < 1 or args.repeat < 1:
+        parser.error("--matches and --repeat must be at least 1")
+
+    if args.write:
+        write_matches(args.write, generate_event(args.teams, args.matches, args.seed))
+        print(f"Wrote {args.matches} matches for {args.teams} teams to {args.write}")
+        return
+
+    results = run_benchmarks(args.teams, args.matches, args.predictions, args.seed, args.repeat)
+    for name, value in results.items():
+        print(f"{name:>24}: {value:,.4f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'teams': args.teams,
+                'matches': args.matches,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if (baseline['teams'], baseline['matches']) != (args.teams, args.matches):
+            print(f"\nBaseline was recorded for {baseline['teams']} teams and {baseline['matches']} matches")
+            sys.exit(1)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for name, base, value, change in regressions:
+                print(f"{name}: {base:,.4f} -> {value:,.4f} ({change:.0%} worse)")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import heapq
+import json
+
+import numpy as np
+
+from ratingstate import RatingCheckpoint
+from statboticsdata import FRCRatingSystem
+
+ALLIANCE_COUNT = 8
+
+def serpentine_order(alliance_count=ALLIANCE_COUNT):
+    # (alliance, round) for every pick: 1..8 then 8..1
+    first_round = [(alliance, 1) for alliance in range(alliance_count)]
+    second_round = [(alliance, 2) for alliance in reversed(range(alliance_count))]
+    return first_round + second_round
+
+class DraftOptimizer:
+    def __init__(self, rating_system, standings, our_team):
+        # Captains come from event rank; everything else works on dense indexes
+        standings = sorted(standings, key=lambda team: team['rank'])
+        self.teams = np.array([team['team_number'] for team in standings], dtype=np.int64)
+        self.index = {team: i for i, team in enumerate(self.teams.tolist())}
+        self.ratings = rating_system.engine.rating_array(self.teams)
+        if our_team not in self.index:
+            raise ValueError(f"Team {our_team} is not at this event")
+        self.our_team = our_team
+
+        # Pair and triple alliance ratings are sums of team ratings, so the
+        # tables are an outer sum plus the rating vector for the third team
+        self.pair_ratings = self.ratings[:, None] + self.ratings[None, :]
+
+    def _next_captain(self, alliances, alliance, taken, next_captain):
+        # Captains are fixed when their alliance is first on the clock, so a
+        # higher seed can still pick the team that would have been captain.
+        # A small event can run out of teams, leaving the alliance empty
+        if not alliances[alliance]:
+            while next_captain in taken:
+                next_captain += 1
+            if next_captain < len(self.teams):
+                alliances[alliance].append(next_captain)
+                taken.add(next_captain)
+        return next_captain
+
+    def _replay(self, picks):
+        # Apply the picks made so far and return where the draft resumes
+        alliances = [[] for _ in range(ALLIANCE_COUNT)]
+        taken = set()
+        next_captain = 0
+        for position, (alliance, _) in enumerate(serpentine_order()):
+            next_captain = self._next_captain(alliances, alliance, taken, next_captain)
+            if position == len(picks):
+                return alliances, taken, position, next_captain
+            if picks[position] not in self.index:
+                raise ValueError(f"Team {picks[position]} is not at this event")
+            team = self.index[picks[position]]
+            if team in taken:
+                raise ValueError(f"Team {picks[position]} was already picked")
+            alliances[alliance].append(team)
+            taken.add(team)
+        raise ValueError("Alliance selection is already complete")
+
+    def _simulate(self, state, heap, our, first_pick=None, stop_at_second_pick=False):
+        # Play the rest of the draft with every other captain taking the
+        # highest-rated team left; we never get picked, we're a captain
+        alliances, taken, position, next_captain = state
+        alliances = [list(alliance) for alliance in alliances]
+        taken = set(taken)
+        for alliance, draft_round in serpentine_order()[position:]:
+            next_captain = self._next_captain(alliances, alliance, taken, next_captain)
+            if not alliances[alliance]:
+                continue
+            ours = alliances[alliance][0] == our
+            if ours and draft_round == 2 and stop_at_second_pick:
+                break
+            if ours and first_pick is not None:
+                if first_pick in taken:
+                    # Gone before our turn, so it isn't really an option
+                    return None, taken
+                team, first_pick = first_pick, None
+            else:
+                while heap and (heap[0][1] in taken or heap[0][1] == our):
+                    heapq.heappop(heap)
+                if not heap:
+                    # Everyone left has been picked
+                    continue
+                team = heapq.heappop(heap)[1]
+            alliances[alliance].append(team)
+            taken.add(team)
+        return alliances, taken
+
+    def solve(self, picks=(), top_k=10):
+        state = self._replay(list(picks))
+        alliances, taken = state[0], state[1]
+        our = self.index[self.our_team]
+        if our in taken and not any(alliance[:1] == [our] for alliance in alliances):
+            raise ValueError(f"Team {self.our_team} has already been picked")
+
+        available = [(-rating, i) for i, rating in enumerate(self.ratings.tolist()) if i not in taken and i != our]
+        heapq.heapify(available)
+        candidates = [i for _, i in sorted(available)]
+
+        our_alliance = next((i for i, alliance in enumerate(alliances) if alliance[:1] == [our]), None)
+        if our_alliance is not None and len(alliances[our_alliance]) > 1:
+            # First pick is locked in; rank second picks on the pool we
+            # expect to be left when our turn comes back around
+            first_pick = alliances[our_alliance][1]
+            _, predicted_taken = self._simulate(state, list(available), our, stop_at_second_pick=True)
+            pool = [i for i in candidates if i not in predicted_taken]
+            if not pool:
+                raise ValueError("No teams are projected to be left for our second pick")
+            ranked = [(self.pair_ratings[our, first_pick] + self.ratings[i], first_pick, i) for i in pool[:top_k]]
+            finished, _ = self._simulate(state, list(available), our)
+            return self._result(ranked, finished, our, second=True)
+
+        # Rank first picks by alliance rating once the rest of the draft plays
+        # out. Candidates come in rating order, so the bound only falls and we
+        # stop as soon as it can't beat the current top k
+        best = []
+        for rank, first_pick in enumerate(candidates):
+            best_other = candidates[1:2] if rank == 0 else candidates[:1]
+            bound = self.pair_ratings[our, first_pick] + self.ratings[best_other].sum()
+            if len(best) == top_k and bound <= best[0][0]:
+                break
+            finished, _ = self._simulate(state, list(available), our, first_pick)
+            if finished is None:
+                continue
+            our_picks = next((alliance for alliance in finished if alliance[:1] == [our]), None)
+            if our_picks is None:
+                raise ValueError(f"Team {self.our_team} is not projected to be an alliance captain")
+            # A small event can run out of teams before our second pick
+            second_pick = our_picks[2] if len(our_picks) > 2 else None
+            strength = self.pair_ratings[our, first_pick] + (self.ratings[second_pick] if second_pick is not None else 0)
+            entry = (strength, -rank, first_pick, second_pick, finished)
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heappushpop(best, entry)
+
+        if not best:
+            raise ValueError("No teams are available for our first pick")
+        best.sort(reverse=True)
+        ranked = [(strength, first_pick, second_pick) for strength, _, first_pick, second_pick, _ in best]
+        return self._result(ranked, best[0][4], our, second=False)
+
+    def _result(self, ranked, alliances, our, second):
+        pick_list = []
+        for rank, (strength, first_pick, second_pick) in enumerate(ranked):
+            team = int(self.teams[second_pick if second else first_pick])
+            entry = {
+                'id': team,
+                'number': team,
+                'rank': rank + 1,
+                'expected_alliance_rating': float(strength)
+            }
+            if not second:
+                entry['expected_second_pick'] = int(self.teams[second_pick]) if second_pick is not None else None
+            pick_list.append(entry)
+        return {
+            'alliance': next(i for i, alliance in enumerate(alliances) if alliance[:1] == [our]) + 1,
+            'pick': 'second' if second else 'first',
+            'pick_list': pick_list,
+            'predicted_alliances': [[int(self.teams[i]) for i in alliance] for alliance in alliances]
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank our picks for the serpentine alliance selection draft')
+    parser.add_argument('picks', nargs='*', type=int, help='teams picked so far, in draft order')
+    parser.add_argument('--team', type=int, required=True, help='our team number; it must be projected to be an alliance captain')
+    parser.add_argument('--teams', default='../app/data/teams.json')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', default='picklist.json')
+    args = parser.parse_args()
+
+    rating_system = FRCRatingSystem(k_factor=32)
+    RatingCheckpoint(rating_system).load()
+    with open(args.teams, 'r') as f:
+        standings = json.load(f)['teams']
+
+    try:
+        optimizer = DraftOptimizer(rating_system, standings, args.team)
+        result = optimizer.solve(args.picks, top_k=args.top)
+    except ValueError as e:
+        print(f"Error solving draft: {e}")
+        return
+
+    print(f"\nAlliance {result['alliance']} {result['pick']} pick:")
+    for team in result['pick_list']:
+        print(f"{team['rank']:>2}. Team {team['number']}: {team['expected_alliance_rating']:.1f}")
+
+    # Same shape the PickList screen keeps in storage
+    with open(args.output, 'w') as f:
+        json.dump(result['pick_list'], f, indent=2)
+    print(f"\nSaved pick list to {args.output}")
+
+if __name__ == "__main__":
+    main()
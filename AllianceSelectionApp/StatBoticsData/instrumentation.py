@@ -0,0 +1,48 @@
+import functools
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Opt-in call counts and timings. Nothing is wrapped until instrument() is
+# called, so an uninstrumented run pays nothing
+class Instrumentation:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def instrument(self, obj, method_name, label=None):
+        # Replace a bound method on this one object with a timed wrapper
+        label = label or method_name
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.seconds[label] += time.perf_counter() - start
+                self.calls[label] += 1
+
+        setattr(obj, method_name, timed_method)
+
+    @contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[label] += time.perf_counter() - start
+            self.calls[label] += 1
+
+    def report(self):
+        lines = [f"{'Operation':<20} {'Calls':>10} {'Total ms':>10} {'Mean us':>10}"]
+        for label in sorted(self.seconds, key=lambda label: -self.seconds[label]):
+            calls, seconds = self.calls[label], self.seconds[label]
+            lines.append(f"{label:<20} {calls:>10} {seconds * 1e3:>10.2f} {seconds / calls * 1e6:>10.2f}")
+        return '\n'.join(lines)
+
+# Stand-in when instrumentation is off
+@contextmanager
+def untimed(label):
+    yield
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# One row per match, fixed-width team and score columns
+MATCH_DTYPE = np.dtype([
+    ('match_number', np.int32),
+    ('red_alliance', np.int32, (3,)),
+    ('blue_alliance', np.int32, (3,)),
+    ('red_score', np.int32),
+    ('blue_score', np.int32),
+])
+
+CSV_COLUMNS = ['match_number', 'red1', 'red2', 'red3', 'blue1', 'blue2', 'blue3', 'red_score', 'blue_score']
+
+def _csv_rows(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [header.index(column) for column in CSV_COLUMNS]
+    for row in reader:
+        if row:
+            values = [int(row[i]) for i in columns]
+            yield values[0], values[1:4], values[4:7], values[7], values[8]
+
+def _jsonl_rows(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            match = json.loads(line)
+            yield (match['match_number'], match['red_alliance'], match['blue_alliance'],
+                   match['red_score'], match['blue_score'])
+
+def read_matches(path, chunk_size=65536):
+    # Stream the text file into fixed-size chunks instead of a list of dicts
+    rows = _csv_rows if path.endswith('.csv') else _jsonl_rows
+    chunks = []
+    chunk = np.empty(chunk_size, dtype=MATCH_DTYPE)
+    filled = 0
+    with open(path, 'r', newline='') as f:
+        for row in rows(f):
+            chunk[filled] = row
+            filled += 1
+            if filled == chunk_size:
+                chunks.append(chunk)
+                chunk = np.empty(chunk_size, dtype=MATCH_DTYPE)
+                filled = 0
+    chunks.append(chunk[:filled])
+    return np.concatenate(chunks)
+
+def cache_path(path):
+    # The cache name records the source's size and mtime, so any change to
+    # the source (including a restore with an older mtime) misses the cache
+    directory, name = os.path.split(path)
+    stat = os.stat(path)
+    return os.path.join(directory, f'.{name}.{stat.st_size}-{stat.st_mtime_ns}.npy')
+
+def _save_cache(cached, matches):
+    # Write to a temp file and swap it in, so a crash or a second writer
+    # never leaves a truncated cache behind
+    directory, name = os.path.split(cached)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, matches)
+        os.replace(tmp_path, cached)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # Drop caches for older versions of the same source
+    prefix = name.rsplit('.', 2)[0] + '.'
+    for other in os.listdir(directory or '.'):
+        stamp = other[len(prefix):-len('.npy')]
+        if other.startswith(prefix) and other.endswith('.npy') and '.' not in stamp and other != name:
+            try:
+                os.unlink(os.path.join(directory, other))
+            except OSError:
+                pass
+
+def load_matches(path, use_cache=True):
+    # Memory-map the binary cache when it matches the current source file
+    if not use_cache:
+        return read_matches(path)
+
+    cached = cache_path(path)
+    if os.path.exists(cached):
+        return np.load(cached, mmap_mode='r')
+
+    matches = read_matches(path)
+    _save_cache(cached, matches)
+    return matches
+
+def match_margins(matches):
+    return np.abs(matches['red_score'] - matches['blue_score'])
@@ -0,0 +1,194 @@
+import json
+import os
+from bisect import bisect_right
+
+# Applied match numbers per event as sorted, disjoint [first, last] ranges.
+# Match numbers mostly arrive in order, so an event is usually one range and
+# the snapshot stays the same size however long the history gets
+class AppliedMatches:
+    def __init__(self, ranges=None):
+        self._starts = {}
+        self._ends = {}
+        self._count = 0
+        for event, event_ranges in (ranges or {}).items():
+            event_ranges = sorted(event_ranges)
+            self._starts[event] = [first for first, _ in event_ranges]
+            self._ends[event] = [last for _, last in event_ranges]
+            self._count += sum(last - first + 1 for first, last in event_ranges)
+
+    def __contains__(self, key):
+        event, match_number = key
+        starts = self._starts.get(event)
+        if not starts:
+            return False
+        i = bisect_right(starts, match_number) - 1
+        return i >= 0 and match_number <= self._ends[event][i]
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for event, starts in self._starts.items():
+            for first, last in zip(starts, self._ends[event]):
+                for match_number in range(first, last + 1):
+                    yield event, match_number
+
+    def add(self, key):
+        if key in self:
+            return
+        event, match_number = key
+        starts = self._starts.setdefault(event, [])
+        ends = self._ends.setdefault(event, [])
+        # Join the range ending just below and/or starting just above
+        i = bisect_right(starts, match_number) - 1
+        joins_below = i >= 0 and ends[i] == match_number - 1
+        joins_above = i + 1 < len(starts) and starts[i + 1] == match_number + 1
+        if joins_below and joins_above:
+            ends[i] = ends[i + 1]
+            del starts[i + 1], ends[i + 1]
+        elif joins_below:
+            ends[i] = match_number
+        elif joins_above:
+            starts[i + 1] = match_number
+        else:
+            starts.insert(i + 1, match_number)
+            ends.insert(i + 1, match_number)
+        self._count += 1
+
+    def ranges(self):
+        return {event: [list(r) for r in zip(starts, self._ends[event])] for event, starts in self._starts.items()}
+
+# Persisted rating state: a compacted snapshot plus an append-only log of
+# matches applied since that snapshot. Matches are identified by event and
+# match number, so late, out-of-order or renumbered matches still apply once
+class RatingCheckpoint:
+    def __init__(self, rating_system, snapshot_path='team_ratings.json', log_path='team_ratings.log', snapshot_every=50):
+        self.rating_system = rating_system
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.snapshot_every = snapshot_every
+        self.applied = AppliedMatches()
+        self.last_match = 0
+        self.pending = 0
+        self._log = None
+
+    def load(self):
+        # Returns False when there is no usable state and ratings start fresh
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = None
+
+        # Older files are a bare {team: rating} dict with no record of which
+        # matches produced them, so they can't be replayed on top of safely
+        if snapshot is not None and 'ratings' in snapshot:
+            self.rating_system.team_ratings = snapshot['ratings']
+            self.last_match = snapshot['last_match']
+            applied = snapshot.get('applied')
+            if isinstance(applied, dict):
+                self.applied = AppliedMatches(applied)
+            elif applied is not None:
+                # Earlier snapshots listed every (event, match_number) pair
+                self.applied = AppliedMatches()
+                for event, match_number in applied:
+                    self.applied.add((event, match_number))
+            else:
+                # Snapshots from before applied matches were recorded covered
+                # matches 1 through last_match of a single event
+                self.applied = AppliedMatches({'': [[1, self.last_match]]} if self.last_match else {})
+
+        try:
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # A line cut short by a crash, or a bad match logged by an
+                    # older version, is skipped so it can't block every load
+                    try:
+                        match = json.loads(line)
+                        self._check(match)
+                    except (KeyError, TypeError, ValueError) as e:
+                        print(f"Skipping unreadable match log entry: {e}")
+                        continue
+                    if self._replay(match):
+                        self.pending += 1
+        except FileNotFoundError:
+            pass
+
+        return bool(self.applied)
+
+    def _check(self, match):
+        self.rating_system.engine.check_teams(match['red_alliance'] + match['blue_alliance'])
+
+    def _replay(self, match):
+        key = (match.get('event', ''), match['match_number'])
+        if key in self.applied:
+            return False
+        self.rating_system.record_match(
+            match['red_alliance'],
+            match['blue_alliance'],
+            match['red_score'],
+            match['blue_score']
+        )
+        self.applied.add(key)
+        self.last_match = match['match_number']
+        return True
+
+    def apply(self, match_number, red_alliance, blue_alliance, red_score, blue_score, event=''):
+        match = {
+            'event': event,
+            'match_number': match_number,
+            'red_alliance': list(red_alliance),
+            'blue_alliance': list(blue_alliance),
+            'red_score': red_score,
+            'blue_score': blue_score
+        }
+        if (event, match_number) in self.applied:
+            return False
+
+        # Anything the engine would reject has to be caught before it is
+        # logged. Then log first: if the write fails the ratings are left
+        # untouched
+        self._check(match)
+        self.append_log(match)
+        self._replay(match)
+
+        self.pending += 1
+        if self.pending >= self.snapshot_every:
+            self.compact()
+        return True
+
+    def append_log(self, match):
+        if self._log is None:
+            self._log = open(self.log_path, 'a')
+        self._log.write(json.dumps(match) + '\n')
+        self._log.flush()
+
+    def compact(self):
+        snapshot = {
+            'last_match': self.last_match,
+            'applied': self.applied.ranges(),
+            'ratings': self.rating_system.team_ratings.copy()
+        }
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            # dumps takes the C encoder; dump streams through the Python one
+            f.write(json.dumps(snapshot))
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Everything in the log is now in the snapshot
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, 'w')
+        self.pending = 0
+
+    def close(self):
+        # Fold any logged matches into the snapshot; with nothing new the
+        # snapshot is left alone
+        if self.pending:
+            self.compact()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
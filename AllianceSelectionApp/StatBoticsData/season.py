@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+import numpy as np
+
+from matchstore import load_matches
+from statboticsdata import FRCRatingSystem
+
+def load_season(path):
+    # Manifest is a JSON list of {"event", "week", "matches"}; match paths
+    # are relative to the manifest
+    with open(path, 'r') as f:
+        events = json.load(f)
+    directory = os.path.dirname(path)
+    for event in events:
+        event['matches'] = os.path.join(directory, event['matches'])
+    return sorted(events, key=lambda event: event['week'])
+
+def replay_event(matches_path, start_ratings, params):
+    # Returns the rating change for every team this event touched
+    rating_system = FRCRatingSystem(**params)
+    rating_system.team_ratings = start_ratings
+    known = rating_system.engine.size
+    start = rating_system.engine.ratings.copy()
+
+    matches = load_matches(matches_path)
+    columns = zip(
+        matches['red_alliance'].tolist(),
+        matches['blue_alliance'].tolist(),
+        matches['red_score'].tolist(),
+        matches['blue_score'].tolist()
+    )
+    for red_alliance, blue_alliance, red_score, blue_score in columns:
+        rating_system.record_match(red_alliance, blue_alliance, red_score, blue_score)
+
+    engine = rating_system.engine
+    deltas = engine.ratings - rating_system.initial_rating
+    deltas[:known] = engine.ratings[:known] - start
+    changed = deltas != 0
+    return engine.team_numbers[changed], deltas[changed]
+
+class SeasonRatings:
+    def __init__(self, k_factor=32, initial_rating=1500, margin_scale=100, split=3, regression=0.2):
+        self.params = {
+            'k_factor': k_factor,
+            'initial_rating': initial_rating,
+            'margin_scale': margin_scale,
+            'split': split
+        }
+        self.regression = regression
+        self.rating_system = FRCRatingSystem(**self.params)
+
+    def run(self, events, workers=None):
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for index, (week, week_events) in enumerate(groupby(events, key=lambda event: event['week'])):
+                week_events = list(week_events)
+                if index:
+                    self.rating_system.engine.regress(self.regression)
+                self.run_week(week_events, pool)
+                print(f"Week {week}: {len(week_events)} events, {self.rating_system.engine.size} teams rated")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def run_week(self, week_events, pool=None):
+        # Events in the same week all start from the same ratings; their
+        # changes are summed so a team at two events keeps both
+        start_ratings = self.rating_system.team_ratings.copy()
+        paths = [event['matches'] for event in week_events]
+        if pool is None:
+            results = [replay_event(path, start_ratings, self.params) for path in paths]
+        else:
+            results = pool.map(
+                replay_event,
+                paths,
+                [start_ratings] * len(paths),
+                [self.params] * len(paths)
+            )
+        for teams, deltas in results:
+            self.rating_system.engine.apply_deltas(teams, deltas)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build season ratings from many events')
+    parser.add_argument('season', help='JSON manifest of events with week and match file')
+    parser.add_argument('--k-factor', type=float, default=32)
+    parser.add_argument('--initial-rating', type=float, default=1500)
+    parser.add_argument('--regression', type=float, default=0.2, help='fraction pulled back toward initial rating between weeks')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='season_ratings.json')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    season = SeasonRatings(
+        k_factor=args.k_factor,
+        initial_rating=args.initial_rating,
+        regression=args.regression
+    )
+    season.run(load_season(args.season), args.workers)
+
+    team_ratings = season.rating_system.team_ratings.copy()
+    print("\nTop Teams:")
+    for team, rating in sorted(team_ratings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"Team {team}: {rating:.1f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(team_ratings, f)
+    print(f"\nSaved season ratings to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ratingstate import RatingCheckpoint
+from statboticsdata import MAX_TEAM_NUMBER, FRCRatingSystem
+
+class PredictionCache:
+    # LRU cache keyed on rating version plus the sorted alliances, so any
+    # rating update makes older entries unreachable and they age out
+    def __init__(self, rating_system, maxsize=65536):
+        self.rating_system = rating_system
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, red_alliance, blue_alliance):
+        red = tuple(sorted(red_alliance))
+        blue = tuple(sorted(blue_alliance))
+        # Store each matchup once; a swapped lookup flips the result
+        if red <= blue:
+            return (self.rating_system.rating_version, red, blue), False
+        return (self.rating_system.rating_version, blue, red), True
+
+    def _get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return result
+
+    def _put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _oriented(result, swapped):
+        if not swapped:
+            return dict(result)
+        return {
+            'red_win_probability': result['blue_win_probability'],
+            'blue_win_probability': result['red_win_probability'],
+            'red_alliance_rating': result['blue_alliance_rating'],
+            'blue_alliance_rating': result['red_alliance_rating']
+        }
+
+    def predict(self, red_alliance, blue_alliance):
+        key, swapped = self._key(red_alliance, blue_alliance)
+        result = self._get(key)
+        if result is None:
+            result = self.rating_system.predict_match(key[1], key[2])
+            self._put(key, result)
+        return self._oriented(result, swapped)
+
+    def predict_many(self, matchups):
+        # Cache misses are scored together in one vectorized pass
+        keys = [self._key(red, blue) for red, blue in matchups]
+        results = [self._get(key) for key, _ in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            alliances = [[keys[i][0][1], keys[i][0][2]] for i in missing]
+            engine = self.rating_system.engine
+            alliance_ratings = engine.alliance_ratings(alliances)
+            probabilities = engine.predict_matches(alliances)
+            for i, (red_rating, blue_rating), probability in zip(missing, alliance_ratings.tolist(), probabilities.tolist()):
+                results[i] = {
+                    'red_win_probability': probability,
+                    'blue_win_probability': 1 - probability,
+                    'red_alliance_rating': red_rating,
+                    'blue_alliance_rating': blue_rating
+                }
+                self._put(keys[i][0], results[i])
+        return [self._oriented(result, swapped) for result, (_, swapped) in zip(results, keys)]
+
+class PredictionService:
+    def __init__(self, rating_system, checkpoint=None, maxsize=65536):
+        self.rating_system = rating_system
+        self.checkpoint = checkpoint
+        self.cache = PredictionCache(rating_system, maxsize)
+        self.lock = threading.Lock()
+
+    def status(self):
+        return {
+            'rating_version': self.rating_system.rating_version,
+            'teams': self.rating_system.engine.size,
+            'matches_applied': len(self.checkpoint.applied) if self.checkpoint else None,
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses
+        }
+
+    def record_match(self, match):
+        with self.lock:
+            if self.checkpoint is not None:
+                applied = self.checkpoint.apply(
+                    match['match_number'],
+                    match['red_alliance'],
+                    match['blue_alliance'],
+                    match['red_score'],
+                    match['blue_score'],
+                    match['event']
+                )
+            else:
+                self.rating_system.record_match(
+                    match['red_alliance'],
+                    match['blue_alliance'],
+                    match['red_score'],
+                    match['blue_score']
+                )
+                applied = True
+        return {'applied': applied, 'rating_version': self.rating_system.rating_version}
+
+def _positive_int(value, name, maximum=None):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    if maximum is not None and value > maximum:
+        raise ValueError(f"{name} must be at most {maximum}")
+    return value
+
+def _alliances(matchup):
+    red = [_positive_int(team, 'Team number', MAX_TEAM_NUMBER) for team in matchup['red_alliance']]
+    blue = [_positive_int(team, 'Team number', MAX_TEAM_NUMBER) for team in matchup['blue_alliance']]
+    if len(red) != 3 or len(blue) != 3:
+        raise ValueError("Alliances must have three teams")
+    if len(set(red + blue)) != 6:
+        raise ValueError("A team can only appear once in a match")
+    return red, blue
+
+def _match(body):
+    # Results are permanent once logged, so check everything up front
+    red, blue = _alliances(body)
+    scores = [body['red_score'], body['blue_score']]
+    if any(isinstance(score, bool) or not isinstance(score, int) or score < 0 for score in scores):
+        raise ValueError("Scores must be non-negative integers")
+    event = body.get('event', '')
+    if not isinstance(event, str):
+        raise ValueError("Event must be a string")
+    return {
+        'event': event,
+        'match_number': _positive_int(body['match_number'], 'Match number'),
+        'red_alliance': red,
+        'blue_alliance': blue,
+        'red_score': scores[0],
+        'blue_score': scores[1]
+    }
+
+def make_handler(service):
+    class RequestHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            # The app's web build calls this from another origin
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _body(self):
+            length = int(self.headers.get('Content-Length', 0))
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.end_headers()
+
+        def do_GET(self):
+            if self.path == '/status':
+                self._send(200, service.status())
+            elif self.path == '/ratings':
+                self._send(200, service.rating_system.team_ratings.copy())
+            else:
+                self._send(404, {'error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            try:
+                body = self._body()
+                if self.path == '/predict':
+                    alliances = _alliances(body)
+                    with service.lock:
+                        prediction = service.cache.predict(*alliances)
+                    self._send(200, prediction)
+                elif self.path == '/predict/bulk':
+                    matchups = [_alliances(matchup) for matchup in body['matchups']]
+                    with service.lock:
+                        predictions = service.cache.predict_many(matchups)
+                        rating_version = service.rating_system.rating_version
+                    self._send(200, {'rating_version': rating_version, 'predictions': predictions})
+                elif self.path == '/match':
+                    self._send(200, service.record_match(_match(body)))
+                else:
+                    self._send(404, {'error': f"Unknown path {self.path}"})
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {'error': str(e)})
+            except OSError as e:
+                self._send(500, {'error': f"Could not save match: {e}"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return RequestHandler
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve match predictions to the app over local HTTP/JSON')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8075)
+    parser.add_argument('--cache-size', type=int, default=65536)
+    args = parser.parse_args()
+
+    rating_system = FRCRatingSystem(k_factor=32)
+    checkpoint = RatingCheckpoint(rating_system)
+    checkpoint.load()
+    service = PredictionService(rating_system, checkpoint, args.cache_size)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving predictions on http://{args.host}:{args.port} ({len(checkpoint.applied)} matches applied)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        checkpoint.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ratingstate import RatingCheckpoint
+from statboticsdata import FRCRatingSystem
+
+# Crescendo ranking: 2 RP for a win, 1 for a tie, up to 2 bonus RP per match
+WIN_POINTS = 2
+BONUS_POINTS = 2
+CAPTAIN_SLOTS = 8
+
+def load_standings(path='../app/data/teams.json'):
+    with open(path, 'r') as f:
+        return json.load(f)['teams']
+
+def load_schedule(path):
+    # JSONL with match_number, red_alliance and blue_alliance; scores are ignored
+    schedule = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                match = json.loads(line)
+                schedule.append((match['red_alliance'], match['blue_alliance']))
+    return np.array(schedule, dtype=np.int64).reshape(-1, 2, 3)
+
+class EventState:
+    # Dense per-team arrays for everything the simulation needs
+    def __init__(self, standings, schedule):
+        teams = [team['team_number'] for team in standings]
+        teams += sorted(set(schedule.ravel().tolist()) - set(teams))
+        self.teams = np.array(teams, dtype=np.int64)
+        index = {team: i for i, team in enumerate(teams)}
+
+        self.ranking_points = np.zeros(len(teams))
+        self.matches_played = np.zeros(len(teams))
+        self.coop = np.zeros(len(teams))
+        bonus_rate = np.zeros(len(teams))
+        for team in standings:
+            i = index[team['team_number']]
+            record = team['record']
+            played = team['matches_played']
+            self.ranking_points[i] = team['total_ranking_points']
+            self.matches_played[i] = played
+            self.coop[i] = team['avg_coop']
+            if played:
+                bonus = team['total_ranking_points'] - WIN_POINTS * record['wins'] - record['ties']
+                bonus_rate[i] = min(max(bonus / played, 0), BONUS_POINTS)
+
+        self.schedule = np.vectorize(index.__getitem__, otypes=[np.int64])(schedule)
+        self.matches_played += np.bincount(self.schedule.ravel(), minlength=len(teams))
+
+        # Alliance-level bonus chance: the mean of its teams' bonus RP rates
+        self.bonus_probability = bonus_rate[self.schedule].mean(axis=-1) / BONUS_POINTS
+
+        # Incidence matrices turn per-match alliance RP into per-team totals
+        self.red_incidence = self._incidence(self.schedule[:, 0])
+        self.blue_incidence = self._incidence(self.schedule[:, 1])
+
+    def _incidence(self, alliances):
+        incidence = np.zeros((len(alliances), len(self.teams)))
+        np.add.at(incidence, (np.arange(len(alliances))[:, None], alliances), 1)
+        return incidence
+
+def _simulate_chunk(state, red_win_probability, trials, seed, batch_size=5000):
+    rng = np.random.default_rng(seed)
+    team_count = len(state.teams)
+    rank_counts = np.zeros((team_count, team_count), dtype=np.int64)
+    # Tiebreak on avg_coop like the app, then randomly
+    tiebreak = state.coop / (state.coop.max() + 1) * 1e-3
+
+    while trials > 0:
+        batch = min(batch_size, trials)
+        trials -= batch
+
+        red_wins = rng.random((batch, len(red_win_probability))) < red_win_probability
+        red_points = WIN_POINTS * red_wins + rng.binomial(BONUS_POINTS, state.bonus_probability[:, 0], red_wins.shape)
+        blue_points = WIN_POINTS * ~red_wins + rng.binomial(BONUS_POINTS, state.bonus_probability[:, 1], red_wins.shape)
+        points = state.ranking_points + red_points @ state.red_incidence + blue_points @ state.blue_incidence
+
+        ranking_score = points / np.maximum(state.matches_played, 1)
+        ranking_score += tiebreak + rng.random((batch, team_count)) * 1e-6
+        order = np.argsort(-ranking_score, axis=1)
+        # order[t, r] is the team at rank r in trial t
+        cells = (order * team_count + np.arange(team_count)).ravel()
+        rank_counts += np.bincount(cells, minlength=team_count * team_count).reshape(team_count, team_count)
+
+    return rank_counts
+
+def simulate_rankings(rating_system, standings, schedule, trials=20000, workers=None, seed=0):
+    state = EventState(standings, schedule)
+    red_win_probability = rating_system.predict_matches(schedule)
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, trials))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    splits = [trials // workers + (i < trials % workers) for i in range(workers)]
+
+    if workers == 1:
+        rank_counts = _simulate_chunk(state, red_win_probability, trials, seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                _simulate_chunk,
+                [state] * workers,
+                [red_win_probability] * workers,
+                splits,
+                seeds
+            )
+            rank_counts = sum(results)
+
+    return state.teams, rank_counts / trials
+
+def summarize(teams, rank_distribution):
+    ranks = np.arange(1, rank_distribution.shape[1] + 1)
+    summary = []
+    for team, distribution in zip(teams.tolist(), rank_distribution):
+        summary.append({
+            'team_number': team,
+            'mean_rank': float(distribution @ ranks),
+            'captain_probability': float(distribution[:CAPTAIN_SLOTS].sum()),
+            'rank_distribution': distribution.tolist()
+        })
+    return sorted(summary, key=lambda team: team['mean_rank'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate the remaining qualification schedule')
+    parser.add_argument('schedule', help='JSONL file of remaining matches')
+    parser.add_argument('--teams', default='../app/data/teams.json')
+    parser.add_argument('--trials', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the full rank distributions as JSON')
+    args = parser.parse_args()
+
+    rating_system = FRCRatingSystem(k_factor=32)
+    RatingCheckpoint(rating_system).load()
+
+    teams, rank_distribution = simulate_rankings(
+        rating_system,
+        load_standings(args.teams),
+        load_schedule(args.schedule),
+        trials=args.trials,
+        workers=args.workers,
+        seed=args.seed
+    )
+    summary = summarize(teams, rank_distribution)
+
+    print(f"{'Team':>6} {'Mean Rank':>10} {'Top 8':>8}")
+    for team in summary:
+        print(f"{team['team_number']:>6} {team['mean_rank']:>10.2f} {team['captain_probability']:>8.1%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The scripts import each other as top-level modules, the same as when
+# they are run from StatBoticsData
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
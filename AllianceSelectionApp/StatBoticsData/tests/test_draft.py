@@ -0,0 +1,111 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from draft import DraftOptimizer, serpentine_order
+from statboticsdata import FRCRatingSystem
+
+TEAM_COUNT = 30
+
+def event(seed=0, team_count=TEAM_COUNT):
+    # Teams 101..130 ranked in order, with ratings unrelated to rank
+    rng = np.random.default_rng(seed)
+    rating_system = FRCRatingSystem(k_factor=32)
+    standings = []
+    for rank, team in enumerate(range(101, 101 + team_count), start=1):
+        rating_system.team_ratings[team] = float(rng.normal(1500, 100))
+        standings.append({'team_number': team, 'rank': rank})
+    return rating_system, standings
+
+def brute_force(optimizer, picks, top_k):
+    # Every possible first pick simulated, without the bound
+    state = optimizer._replay(list(picks))
+    our = optimizer.index[optimizer.our_team]
+    available = [(-rating, i) for i, rating in enumerate(optimizer.ratings.tolist()) if i not in state[1] and i != our]
+    heapq.heapify(available)
+    ranked = []
+    for first_pick in sorted(i for _, i in available):
+        finished, _ = optimizer._simulate(state, list(available), our, first_pick)
+        if finished is None:
+            continue
+        our_picks = next(alliance for alliance in finished if alliance[:1] == [our])
+        strength = optimizer.ratings[our_picks].sum()
+        ranked.append((float(strength), int(optimizer.teams[first_pick])))
+    ranked.sort(key=lambda entry: -entry[0])
+    return ranked[:top_k]
+
+def test_serpentine_order():
+    order = serpentine_order()
+    assert [alliance for alliance, _ in order] == list(range(8)) + list(reversed(range(8)))
+    assert [draft_round for _, draft_round in order] == [1] * 8 + [2] * 8
+
+# Events where the best first picks aren't simply the highest rated teams
+# left, so stopping early on the bound would be caught
+@pytest.mark.parametrize('seed, our_team, top_k', [(0, 101, 5), (0, 104, 3), (2, 105, 5), (7, 104, 5)])
+def test_pruned_ranking_matches_brute_force(seed, our_team, top_k):
+    optimizer = DraftOptimizer(*event(seed), our_team)
+    result = optimizer.solve(top_k=top_k)
+    expected = brute_force(optimizer, (), top_k)
+    assert result['pick'] == 'first'
+    assert [entry['number'] for entry in result['pick_list']] == [team for _, team in expected]
+    assert [entry['expected_alliance_rating'] for entry in result['pick_list']] == pytest.approx([strength for strength, _ in expected])
+
+# Fewer than 24 teams: the draft runs out before every alliance has three
+@pytest.mark.parametrize('team_count, our_team', [(20, 101), (20, 108), (12, 104), (10, 101)])
+def test_small_event(team_count, our_team):
+    optimizer = DraftOptimizer(*event(team_count=team_count), our_team)
+    result = optimizer.solve(top_k=3)
+    expected = brute_force(optimizer, (), 3)
+    assert [entry['number'] for entry in result['pick_list']] == [team for _, team in expected]
+    assert all(len(alliance) <= 3 for alliance in result['predicted_alliances'])
+    assert sum(map(len, result['predicted_alliances'])) == team_count
+
+def test_small_event_without_second_picks():
+    result = DraftOptimizer(*event(team_count=12), 101).solve()
+    assert result['pick_list']
+    assert all(entry['expected_second_pick'] is None for entry in result['pick_list'])
+
+def test_small_event_with_nothing_left_to_pick():
+    optimizer = DraftOptimizer(*event(team_count=9), 108)
+    with pytest.raises(ValueError, match='No teams are available'):
+        optimizer.solve()
+
+def test_picked_teams_are_not_offered():
+    rating_system, standings = event()
+    optimizer = DraftOptimizer(rating_system, standings, 104)
+    top = optimizer.solve()['pick_list'][0]['number']
+    # Alliance 1 takes our best option, alliance 2 takes team 130
+    result = optimizer.solve([top, 130])
+    offered = {entry['number'] for entry in result['pick_list']}
+    assert not offered & {top, 130, 101, 102, 103, 104}
+
+def test_second_pick_after_first_is_locked():
+    optimizer = DraftOptimizer(*event(), 102)
+    first = optimizer.solve()['pick_list'][0]
+    picks = [105, first['number']]
+    result = optimizer.solve(picks)
+    assert result['pick'] == 'second'
+    assert result['alliance'] == 2
+    assert result['predicted_alliances'][1][:2] == [102, first['number']]
+    assert not {entry['number'] for entry in result['pick_list']} & {101, 102, 105, first['number']}
+    ratings = [entry['expected_alliance_rating'] for entry in result['pick_list']]
+    assert ratings == sorted(ratings, reverse=True)
+
+def test_replay_rejects_bad_picks():
+    optimizer = DraftOptimizer(*event(), 101)
+    with pytest.raises(ValueError, match='not at this event'):
+        optimizer.solve([999])
+    with pytest.raises(ValueError, match='already picked'):
+        optimizer.solve([110, 110])
+    with pytest.raises(ValueError, match='already complete'):
+        optimizer._replay(list(range(109, 109 + 16)) + [130])
+
+def test_team_not_at_event():
+    with pytest.raises(ValueError, match='not at this event'):
+        DraftOptimizer(*event(), 999)
+
+def test_picked_team_cannot_plan():
+    optimizer = DraftOptimizer(*event(), 120)
+    with pytest.raises(ValueError, match='already been picked'):
+        optimizer.solve([120])
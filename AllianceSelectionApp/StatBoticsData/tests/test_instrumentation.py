@@ -0,0 +1,55 @@
+import pytest
+
+from instrumentation import Instrumentation, untimed
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def add(self, amount=1):
+        self.count += amount
+        return self.count
+
+    def fail(self):
+        raise RuntimeError("failed")
+
+def test_instrument_counts_calls():
+    instrumentation = Instrumentation()
+    counter, other = Counter(), Counter()
+    instrumentation.instrument(counter, 'add')
+    instrumentation.instrument(counter, 'fail', 'failures')
+
+    assert counter.add() == 1
+    assert counter.add(amount=2) == 3
+    with pytest.raises(RuntimeError):
+        counter.fail()
+    # Only the instrumented object is wrapped
+    other.add()
+
+    assert instrumentation.calls == {'add': 2, 'failures': 1}
+    assert instrumentation.seconds['add'] >= 0
+
+def test_timed_block():
+    instrumentation = Instrumentation()
+    for _ in range(3):
+        with instrumentation.timed('load'):
+            pass
+    with pytest.raises(ValueError):
+        with instrumentation.timed('load'):
+            raise ValueError()
+    assert instrumentation.calls['load'] == 4
+
+def test_report_lists_every_label():
+    instrumentation = Instrumentation()
+    with instrumentation.timed('load_matches'):
+        pass
+    counter = Counter()
+    instrumentation.instrument(counter, 'add', 'update_elo')
+    counter.add()
+    lines = instrumentation.report().splitlines()
+    assert lines[0].split() == ['Operation', 'Calls', 'Total', 'ms', 'Mean', 'us']
+    assert sorted(line.split()[0] for line in lines[1:]) == ['load_matches', 'update_elo']
+
+def test_untimed_does_nothing():
+    with untimed('anything'):
+        pass
@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+
+from matchstore import cache_path, load_matches, read_matches
+
+def write_jsonl(path, matches):
+    with open(path, 'w') as f:
+        for match_number, red, blue, red_score, blue_score in matches:
+            f.write(json.dumps({
+                'match_number': match_number,
+                'red_alliance': red,
+                'blue_alliance': blue,
+                'red_score': red_score,
+                'blue_score': blue_score
+            }) + '\n')
+
+MATCHES = [
+    (1, [1, 2, 3], [4, 5, 6], 50, 30),
+    (2, [1, 4, 7], [2, 5, 8], 20, 45),
+]
+
+def caches(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.npy'))
+
+def test_csv_and_jsonl_read_the_same(tmp_path):
+    jsonl = str(tmp_path / 'matches.jsonl')
+    write_jsonl(jsonl, MATCHES)
+    csv = tmp_path / 'matches.csv'
+    # Extra columns and a different column order are fine
+    csv.write_text(
+        'blue_score,red_score,match_number,red1,red2,red3,blue1,blue2,blue3,event\n'
+        '30,50,1,1,2,3,4,5,6,x\n'
+        '45,20,2,1,4,7,2,5,8,x\n'
+    )
+    np.testing.assert_array_equal(read_matches(jsonl), read_matches(str(csv)))
+
+def test_read_matches_across_chunks(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, MATCHES * 3)
+    matches = read_matches(path, chunk_size=4)
+    assert len(matches) == 6
+    assert matches['red_score'].tolist() == [50, 20] * 3
+
+def test_second_load_uses_cache(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, MATCHES)
+    first = load_matches(path)
+    assert caches(tmp_path) == [os.path.basename(cache_path(path))]
+    second = load_matches(path)
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(second, first)
+
+def test_changed_source_misses_cache(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, MATCHES)
+    load_matches(path)
+    old_cache = caches(tmp_path)
+    stat = os.stat(path)
+
+    # A restored file with an older mtime still has to be reread
+    write_jsonl(path, MATCHES + [(3, [9, 8, 7], [6, 5, 4], 0, 10)])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+    matches = load_matches(path)
+    assert len(matches) == 3
+    # The stale cache is cleaned up and nothing is left half written
+    assert caches(tmp_path) != old_cache
+    assert len(caches(tmp_path)) == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_same_mtime_different_size_misses_cache(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, MATCHES)
+    load_matches(path)
+    stat = os.stat(path)
+
+    write_jsonl(path, MATCHES[:1])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert len(load_matches(path)) == 1
+
+def test_caches_for_other_sources_are_kept(tmp_path):
+    write_jsonl(str(tmp_path / 'a.jsonl'), MATCHES)
+    write_jsonl(str(tmp_path / 'a.jsonl.old.jsonl'), MATCHES)
+    load_matches(str(tmp_path / 'a.jsonl.old.jsonl'))
+    load_matches(str(tmp_path / 'a.jsonl'))
+    assert len(caches(tmp_path)) == 2
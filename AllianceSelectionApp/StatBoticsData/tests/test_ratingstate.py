@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from ratingstate import AppliedMatches, RatingCheckpoint
+from statboticsdata import FRCRatingSystem
+
+MATCHES = [
+    (1, [1, 2, 3], [4, 5, 6], 50, 30),
+    (2, [1, 4, 7], [2, 5, 8], 20, 45),
+    (3, [3, 6, 9], [7, 8, 1], 60, 60),
+    (4, [2, 4, 9], [3, 5, 7], 10, 70),
+]
+
+def checkpoint(tmp_path, snapshot_every=50):
+    return RatingCheckpoint(
+        FRCRatingSystem(k_factor=32),
+        snapshot_path=str(tmp_path / 'team_ratings.json'),
+        log_path=str(tmp_path / 'team_ratings.log'),
+        snapshot_every=snapshot_every
+    )
+
+def replayed(matches):
+    rating_system = FRCRatingSystem(k_factor=32)
+    for _, red, blue, red_score, blue_score in matches:
+        rating_system.record_match(red, blue, red_score, blue_score)
+    return rating_system.team_ratings.copy()
+
+def test_applied_matches_are_skipped(tmp_path):
+    state = checkpoint(tmp_path)
+    assert all(state.apply(*match) for match in MATCHES)
+    assert not any(state.apply(*match) for match in MATCHES)
+    assert state.pending == len(MATCHES)
+    assert state.rating_system.team_ratings.copy() == replayed(MATCHES)
+
+def test_out_of_order_and_other_events_apply(tmp_path):
+    state = checkpoint(tmp_path)
+    state.apply(*MATCHES[2])
+    # A lower match number than the last one applied is still new
+    assert state.apply(*MATCHES[0])
+    # The same match number at another event is a different match
+    assert state.apply(*MATCHES[0], event='playoffs')
+    assert set(state.applied) == {('', 3), ('', 1), ('playoffs', 1)}
+
+def test_close_without_new_matches_leaves_snapshot(tmp_path):
+    state = checkpoint(tmp_path)
+    for match in MATCHES:
+        state.apply(*match)
+    state.close()
+    snapshot = tmp_path / 'team_ratings.json'
+    mtime = snapshot.stat().st_mtime_ns
+
+    state = checkpoint(tmp_path)
+    assert state.load()
+    assert not any(state.apply(*match) for match in MATCHES)
+    state.close()
+    assert snapshot.stat().st_mtime_ns == mtime
+
+def test_compacts_every_snapshot_every_matches(tmp_path):
+    state = checkpoint(tmp_path, snapshot_every=3)
+    for match in MATCHES:
+        state.apply(*match)
+    assert state.pending == 1
+    with open(tmp_path / 'team_ratings.json') as f:
+        assert json.load(f)['applied'] == {'': [[1, 3]]}
+    assert len((tmp_path / 'team_ratings.log').read_text().splitlines()) == 1
+
+def test_crash_recovers_from_log(tmp_path):
+    state = checkpoint(tmp_path, snapshot_every=3)
+    for match in MATCHES:
+        state.apply(*match)
+    # No close(): the last match is only in the log
+    state._log.close()
+
+    recovered = checkpoint(tmp_path)
+    assert recovered.load()
+    assert recovered.pending == 1
+    assert set(recovered.applied) == {('', 1), ('', 2), ('', 3), ('', 4)}
+    assert recovered.rating_system.team_ratings.copy() == pytest.approx(replayed(MATCHES))
+    assert not recovered.apply(*MATCHES[3])
+
+def test_legacy_snapshot_covers_matches_up_to_last_match(tmp_path):
+    ratings = replayed(MATCHES[:2])
+    with open(tmp_path / 'team_ratings.json', 'w') as f:
+        json.dump({'last_match': 2, 'ratings': ratings}, f)
+
+    state = checkpoint(tmp_path)
+    assert state.load()
+    assert not state.apply(*MATCHES[1])
+    assert state.apply(*MATCHES[2])
+
+def test_bare_ratings_file_starts_fresh(tmp_path):
+    with open(tmp_path / 'team_ratings.json', 'w') as f:
+        json.dump({'1': 1600}, f)
+    state = checkpoint(tmp_path)
+    assert not state.load()
+    assert state.rating_system.team_ratings.copy() == {}
+
+def test_invalid_match_is_not_logged(tmp_path):
+    state = checkpoint(tmp_path)
+    state.apply(*MATCHES[0])
+    for team in (0, 9999999999):
+        with pytest.raises(ValueError):
+            state.apply(2, [team, 2, 3], [4, 5, 6], 10, 20)
+    state._log.close()
+    assert len((tmp_path / 'team_ratings.log').read_text().splitlines()) == 1
+
+    recovered = checkpoint(tmp_path)
+    recovered.load()
+    assert set(recovered.applied) == {('', 1)}
+
+def test_unreadable_log_lines_are_skipped(tmp_path):
+    state = checkpoint(tmp_path)
+    for match in MATCHES[:2]:
+        state.apply(*match)
+    state._log.close()
+    with open(tmp_path / 'team_ratings.log', 'a') as f:
+        # A bad match from an older version, then a write cut off by a crash
+        f.write(json.dumps({'match_number': 3, 'red_alliance': [0, 2, 3], 'blue_alliance': [4, 5, 6],
+                            'red_score': 1, 'blue_score': 0}) + '\n')
+        f.write('{"match_number": 4, "red_al')
+
+    recovered = checkpoint(tmp_path)
+    assert recovered.load()
+    assert set(recovered.applied) == {('', 1), ('', 2)}
+    assert recovered.rating_system.team_ratings.copy() == pytest.approx(replayed(MATCHES[:2]))
+
+def test_applied_ranges_merge():
+    applied = AppliedMatches()
+    for match_number in (5, 1, 3, 2, 7, 6):
+        applied.add(('', match_number))
+    applied.add(('playoffs', 1))
+    assert applied.ranges() == {'': [[1, 3], [5, 7]], 'playoffs': [[1, 1]]}
+    assert len(applied) == 7
+    applied.add(('', 4))
+    applied.add(('', 4))
+    assert applied.ranges()[''] == [[1, 7]]
+    assert len(applied) == 8
+    assert ('', 4) in applied and ('', 8) not in applied and ('qualification', 4) not in applied
+
+    restored = AppliedMatches(applied.ranges())
+    assert set(restored) == set(applied)
+    assert len(restored) == 8
+
+def test_snapshot_with_applied_pairs_loads(tmp_path):
+    with open(tmp_path / 'team_ratings.json', 'w') as f:
+        json.dump({'last_match': 3, 'applied': [['', 1], ['', 3]], 'ratings': replayed([MATCHES[0], MATCHES[2]])}, f)
+    state = checkpoint(tmp_path)
+    assert state.load()
+    assert state.apply(*MATCHES[1])
+    assert not state.apply(*MATCHES[2])
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from season import SeasonRatings, load_season
+from statboticsdata import FRCRatingSystem
+
+EVENT_A = [
+    (1, [1, 2, 3], [4, 5, 6], 50, 30),
+    (2, [1, 4, 7], [2, 5, 8], 20, 45),
+    (3, [3, 6, 9], [7, 8, 1], 60, 55),
+]
+EVENT_B = [
+    (1, [1, 5, 9], [10, 11, 12], 35, 40),
+    (2, [2, 10, 6], [3, 11, 7], 70, 20),
+]
+
+def write_jsonl(path, matches):
+    with open(path, 'w') as f:
+        for match_number, red, blue, red_score, blue_score in matches:
+            f.write(json.dumps({
+                'match_number': match_number,
+                'red_alliance': red,
+                'blue_alliance': blue,
+                'red_score': red_score,
+                'blue_score': blue_score
+            }) + '\n')
+
+def season(tmp_path, events):
+    # events is a list of (week, matches)
+    manifest = []
+    for i, (week, matches) in enumerate(events):
+        write_jsonl(tmp_path / f'event{i}.jsonl', matches)
+        manifest.append({'event': f'event{i}', 'week': week, 'matches': f'event{i}.jsonl'})
+    path = tmp_path / 'season.json'
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+    return load_season(str(path))
+
+def replay(rating_system, matches):
+    for _, red, blue, red_score, blue_score in matches:
+        rating_system.record_match(red, blue, red_score, blue_score)
+
+def test_one_event_season_equals_plain_replay(tmp_path):
+    ratings = SeasonRatings()
+    ratings.run(season(tmp_path, [(1, EVENT_A)]), workers=1)
+    expected = FRCRatingSystem(k_factor=32)
+    replay(expected, EVENT_A)
+    assert ratings.rating_system.team_ratings.copy() == pytest.approx(expected.team_ratings.copy())
+
+def test_regression_between_weeks(tmp_path):
+    ratings = SeasonRatings(regression=0.25)
+    ratings.run(season(tmp_path, [(2, EVENT_B), (1, EVENT_A)]), workers=1)
+
+    expected = FRCRatingSystem(k_factor=32)
+    replay(expected, EVENT_A)
+    for team, rating in expected.team_ratings.copy().items():
+        expected.team_ratings[team] = 1500 + (rating - 1500) * 0.75
+    replay(expected, EVENT_B)
+    assert ratings.rating_system.team_ratings.copy() == pytest.approx(expected.team_ratings.copy())
+
+def test_same_week_events_both_count(tmp_path):
+    events = season(tmp_path, [(1, EVENT_A), (1, EVENT_B)])
+    ratings = SeasonRatings()
+    ratings.run(events, workers=1)
+    parallel = SeasonRatings()
+    parallel.run(events, workers=2)
+
+    # Both events start from the same ratings and their changes add up
+    a, b = FRCRatingSystem(k_factor=32), FRCRatingSystem(k_factor=32)
+    replay(a, EVENT_A)
+    replay(b, EVENT_B)
+    expected = {team: 1500.0 for team in set(a.team_ratings) | set(b.team_ratings)}
+    for rating_system in (a, b):
+        for team, rating in rating_system.team_ratings.copy().items():
+            expected[team] += rating - 1500
+    assert ratings.rating_system.team_ratings.copy() == pytest.approx(expected)
+    assert parallel.rating_system.team_ratings.copy() == pytest.approx(expected)
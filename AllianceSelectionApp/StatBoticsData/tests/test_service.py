@@ -0,0 +1,120 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from ratingstate import RatingCheckpoint
+from service import PredictionCache, PredictionService, _match, make_handler
+from statboticsdata import FRCRatingSystem
+
+RED = [1, 2, 3]
+BLUE = [4, 5, 6]
+
+def rating_system():
+    rating_system = FRCRatingSystem(k_factor=32)
+    for team, rating in zip(RED + BLUE, [1600, 1550, 1500, 1450, 1500, 1520]):
+        rating_system.team_ratings[team] = rating
+    return rating_system
+
+def test_cache_hits_until_ratings_change():
+    cache = PredictionCache(rating_system())
+    first = cache.predict(RED, BLUE)
+    assert cache.predict(list(reversed(RED)), BLUE) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.rating_system.update_elo(BLUE, RED, 30)
+    updated = cache.predict(RED, BLUE)
+    assert cache.misses == 2
+    assert updated == cache.rating_system.predict_match(RED, BLUE)
+    assert updated['red_win_probability'] < first['red_win_probability']
+
+def test_swapped_lookup_flips_result():
+    cache = PredictionCache(rating_system())
+    red = cache.predict(RED, BLUE)
+    blue = cache.predict(BLUE, RED)
+    assert cache.hits == 1
+    assert blue['red_win_probability'] == red['blue_win_probability']
+    assert blue['red_alliance_rating'] == red['blue_alliance_rating']
+    assert blue == pytest.approx(cache.rating_system.predict_match(BLUE, RED))
+
+def test_predict_many_matches_predict():
+    cache = PredictionCache(rating_system())
+    single = [cache.predict(RED, BLUE), cache.predict(BLUE, RED)]
+    fresh = PredictionCache(rating_system())
+    bulk = fresh.predict_many([(RED, BLUE), (BLUE, RED), (RED, BLUE)])
+    assert bulk[:2] == pytest.approx(single)
+    assert bulk[2] == bulk[0]
+
+MATCH = {'match_number': 3, 'red_alliance': RED, 'blue_alliance': BLUE, 'red_score': 40, 'blue_score': 30}
+
+@pytest.mark.parametrize('change', [
+    {'red_alliance': [1, 2]},
+    {'red_alliance': [1, 2, 4]},
+    {'red_alliance': [0, 2, 3]},
+    {'red_alliance': [9999999999, 2, 3]},
+    {'red_alliance': [1.5, 2, 3]},
+    {'red_alliance': [True, 2, 3]},
+    {'red_score': -1},
+    {'blue_score': '30'},
+    {'match_number': 0},
+    {'event': 5},
+])
+def test_match_rejects_bad_input(change):
+    with pytest.raises((KeyError, TypeError, ValueError)):
+        _match({**MATCH, **change})
+
+def test_match_rejects_missing_fields():
+    body = dict(MATCH)
+    del body['blue_score']
+    with pytest.raises(KeyError):
+        _match(body)
+
+def test_match_defaults_event():
+    assert _match(MATCH)['event'] == ''
+
+@pytest.fixture
+def server(tmp_path):
+    checkpoint = RatingCheckpoint(
+        rating_system(),
+        snapshot_path=str(tmp_path / 'team_ratings.json'),
+        log_path=str(tmp_path / 'team_ratings.log')
+    )
+    service = PredictionService(checkpoint.rating_system, checkpoint)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(service))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}', tmp_path
+    httpd.shutdown()
+    httpd.server_close()
+    checkpoint.close()
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST')
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+def test_bad_match_is_rejected_and_not_logged(server):
+    url, tmp_path = server
+    status, body = post(url + '/match', {**MATCH, 'red_alliance': [9999999999, 2, 3]})
+    assert status == 400
+    assert not (tmp_path / 'team_ratings.log').exists()
+
+    status, body = post(url + '/match', MATCH)
+    assert status == 200 and body['applied']
+    status, body = post(url + '/match', MATCH)
+    assert status == 200 and not body['applied']
+    assert len((tmp_path / 'team_ratings.log').read_text().splitlines()) == 1
+
+def test_prediction_changes_after_match(server):
+    url, _ = server
+    status, before = post(url + '/predict', {'red_alliance': RED, 'blue_alliance': BLUE})
+    assert status == 200
+    post(url + '/match', {**MATCH, 'red_score': 0, 'blue_score': 50})
+    _, after = post(url + '/predict', {'red_alliance': RED, 'blue_alliance': BLUE})
+    assert after['red_win_probability'] < before['red_win_probability']
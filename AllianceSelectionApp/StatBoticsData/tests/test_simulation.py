@@ -0,0 +1,60 @@
+import numpy as np
+
+from simulation import simulate_rankings, summarize
+from statboticsdata import FRCRatingSystem
+
+def standings(team_count=12):
+    teams = []
+    for rank, team in enumerate(range(201, 201 + team_count), start=1):
+        wins = 8 - rank // 2
+        teams.append({
+            'team_number': team,
+            'rank': rank,
+            'avg_coop': 0.1 * (rank % 3),
+            'record': {'wins': wins, 'losses': 10 - wins, 'ties': 0},
+            'matches_played': 10,
+            'total_ranking_points': 2 * wins + (rank % 4)
+        })
+    return teams
+
+def event():
+    rating_system = FRCRatingSystem(k_factor=32)
+    for team in range(201, 213):
+        rating_system.team_ratings[team] = 1500 + 10 * (team % 7)
+    schedule = np.array([
+        [[201, 202, 203], [204, 205, 206]],
+        [[207, 208, 209], [210, 211, 212]],
+        [[201, 205, 209], [202, 206, 210]],
+        [[203, 207, 211], [204, 208, 212]],
+    ])
+    return rating_system, standings(), schedule
+
+def test_same_seed_same_result():
+    first = simulate_rankings(*event(), trials=2000, workers=1, seed=7)
+    second = simulate_rankings(*event(), trials=2000, workers=1, seed=7)
+    other = simulate_rankings(*event(), trials=2000, workers=1, seed=8)
+    assert first[0].tolist() == second[0].tolist()
+    assert np.array_equal(first[1], second[1])
+    assert not np.array_equal(first[1], other[1])
+
+def test_same_seed_same_result_across_workers():
+    first = simulate_rankings(*event(), trials=2000, workers=2, seed=7)
+    second = simulate_rankings(*event(), trials=2000, workers=2, seed=7)
+    assert np.array_equal(first[1], second[1])
+
+def test_rank_distributions_sum_to_one():
+    teams, distribution = simulate_rankings(*event(), trials=3001, workers=1)
+    assert distribution.shape == (12, 12)
+    # Every team gets exactly one rank, and every rank goes to one team
+    assert np.allclose(distribution.sum(axis=1), 1)
+    assert np.allclose(distribution.sum(axis=0), 1)
+
+def test_unreachable_leader_always_ranks_first():
+    rating_system, teams, schedule = event()
+    teams[0]['total_ranking_points'] = 100
+    teams[0]['record'] = {'wins': 10, 'losses': 0, 'ties': 0}
+    result, distribution = simulate_rankings(rating_system, teams, schedule, trials=500, workers=1)
+    summary = summarize(result, distribution)
+    assert summary[0]['team_number'] == 201
+    assert summary[0]['mean_rank'] == 1
+    assert summary[0]['captain_probability'] == 1
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from statboticsdata import MAX_TEAM_NUMBER, FRCRatingSystem, RatingEngine, main
+
+def test_update_grows_past_capacity():
+    engine = RatingEngine(capacity=4)
+    engine.update([1, 2, 3], [4, 5, 6], 20)
+    assert engine.size == 6
+    assert engine.rating(1) > 1500 > engine.rating(4)
+    assert engine.rating(1) - 1500 == pytest.approx(1500 - engine.rating(6))
+
+def test_team_ratings_writes_through():
+    rating_system = FRCRatingSystem(k_factor=32)
+    rating_system.team_ratings[254] = 1600
+    version = rating_system.rating_version
+    rating_system.team_ratings[254] += 10
+    assert rating_system.get_team_rating(254) == 1610
+    assert rating_system.rating_version > version
+    del rating_system.team_ratings[254]
+    assert 254 not in rating_system.team_ratings
+
+def test_invalid_team_numbers_are_rejected():
+    engine = RatingEngine()
+    with pytest.raises(ValueError):
+        engine.update([-1, 2, 3], [4, 5, 6], 10)
+    with pytest.raises(ValueError):
+        engine.add_teams([0])
+    # Too large for the slot table, which is indexed by team number
+    with pytest.raises(ValueError):
+        engine.update([9999999999, 2, 3], [4, 5, 6], 10)
+    with pytest.raises(ValueError):
+        engine.add_teams([MAX_TEAM_NUMBER + 1])
+    assert engine.size == 0
+    assert len(engine._slots) == 10000
+
+MATCHES = [
+    (1, [1, 2, 3], [4, 5, 6], 50, 30),
+    (2, [7, 8, 9], [10, 11, 12], 20, 45),
+    (3, [1, 4, 7], [2, 5, 8], 60, 10),
+]
+
+def write_matches(path):
+    with open(path, 'w') as f:
+        for match_number, red, blue, red_score, blue_score in MATCHES:
+            f.write(json.dumps({
+                'match_number': match_number,
+                'red_alliance': red,
+                'blue_alliance': blue,
+                'red_score': red_score,
+                'blue_score': blue_score
+            }) + '\n')
+
+def test_quiet_run_writes_trajectory(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write_matches('matches.jsonl')
+    args = ['--matches', 'matches.jsonl', '--quiet', '--trajectory', 'trajectory.jsonl', '--watch', '1', '5']
+    main(args)
+    assert 'After Match' not in capsys.readouterr().out
+
+    expected = []
+    rating_system = FRCRatingSystem(k_factor=32)
+    for match_number, red, blue, red_score, blue_score in MATCHES:
+        rating_system.record_match(red, blue, red_score, blue_score)
+        for team in red + blue:
+            if team in (1, 5):
+                expected.append({'match_number': match_number, 'team': team, 'rating': rating_system.get_team_rating(team)})
+    with open('trajectory.jsonl') as f:
+        rows = [json.loads(line) for line in f]
+    assert rows == pytest.approx(expected)
+    assert [row['match_number'] for row in rows] == [1, 1, 3, 3]
+
+    # Everything is already applied the second time round
+    main(args)
+    assert 'No new matches' in capsys.readouterr().out
+    assert (tmp_path / 'trajectory.jsonl').read_text() == ''
+
+def test_profile_reports_file_io(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write_matches('matches.jsonl')
+    main(['--matches', 'matches.jsonl', '--quiet', '--profile', '--trajectory', 'trajectory.jsonl', '--watch', '1'])
+    report = capsys.readouterr().out.split('Profile:')[1]
+    calls = {line.split()[0]: int(line.split()[1]) for line in report.strip().splitlines()[1:]}
+    assert calls['checkpoint_apply'] == 3
+    assert calls['write_match_log'] == 3
+    assert calls['update_elo'] == 3
+    assert calls['save_ratings'] == 1
+    # Two trajectory writes plus closing the file
+    assert calls['write_trajectory'] == 3
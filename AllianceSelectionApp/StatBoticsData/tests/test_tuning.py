@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+import tuning
+from statboticsdata import FRCRatingSystem
+from tuning import replay_predictions, sweep
+
+MATCH_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'match_data.jsonl')
+
+CONFIG = {'k_factor': 32, 'initial_rating': 1500, 'margin_scale': 100, 'split': 3}
+
+def write_jsonl(path, matches):
+    with open(path, 'w') as f:
+        for match_number, red, blue, red_score, blue_score in matches:
+            f.write(json.dumps({
+                'match_number': match_number,
+                'red_alliance': red,
+                'blue_alliance': blue,
+                'red_score': red_score,
+                'blue_score': blue_score
+            }) + '\n')
+
+TIES = [
+    (1, [1, 2, 3], [4, 5, 6], 40, 40),
+    (2, [1, 4, 7], [2, 5, 8], 25, 25),
+]
+
+def test_empty_history(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, [])
+    assert len(replay_predictions(tuning.load_matches(path), **CONFIG)) == 0
+    with pytest.raises(ValueError, match='No matches'):
+        sweep(path, [CONFIG], workers=1)
+
+def test_all_ties_have_no_accuracy(tmp_path):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, TIES)
+    result, = sweep(path, [CONFIG], workers=1)
+    assert result['accuracy'] is None
+    assert result['brier'] == 0
+    assert tuning._sort_key(result, 'accuracy') == float('inf')
+
+@pytest.mark.parametrize('warmup', [-1, 2, 5])
+def test_warmup_must_leave_matches_to_score(tmp_path, warmup):
+    path = str(tmp_path / 'matches.jsonl')
+    write_jsonl(path, TIES)
+    with pytest.raises(ValueError, match='Warmup'):
+        sweep(path, [CONFIG], warmup=warmup, workers=1)
+
+def test_replay_matches_rating_system_predictions():
+    # One-step-ahead: predict each match, then apply it
+    matches = tuning.load_matches(MATCH_DATA, use_cache=False)
+    for config in (CONFIG, {'k_factor': 20, 'initial_rating': 1400, 'margin_scale': 50, 'split': 2}):
+        rating_system = FRCRatingSystem(**config)
+        expected = []
+        for red, blue, red_score, blue_score in zip(
+            matches['red_alliance'].tolist(),
+            matches['blue_alliance'].tolist(),
+            matches['red_score'].tolist(),
+            matches['blue_score'].tolist()
+        ):
+            expected.append(rating_system.predict_match(red, blue)['red_win_probability'])
+            rating_system.record_match(red, blue, red_score, blue_score)
+        assert replay_predictions(matches, **config).tolist() == pytest.approx(expected, abs=1e-12)
+        # Chunk boundaries don't change anything
+        assert replay_predictions(matches, chunk_size=7, **config).tolist() == pytest.approx(expected, abs=1e-12)
@@ -0,0 +1,161 @@
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from matchstore import load_matches
+from statboticsdata import rating_change
+
+PARAMETERS = ['k_factor', 'initial_rating', 'margin_scale', 'split']
+
+# Ranges for random search, sampled uniformly
+RANDOM_RANGES = {
+    'k_factor': (4, 96),
+    'initial_rating': (1500, 1500),
+    'margin_scale': (25, 400),
+    'split': (1, 6)
+}
+
+# Set once per worker by _load_history; every task reads the same
+# memory-mapped match array
+_history = None
+
+def _load_history(path):
+    # The columnar cache is memory-mapped, so workers share its pages
+    global _history
+    _history = load_matches(path)
+
+def match_outcomes(matches):
+    score_diff = matches['red_score'] - matches['blue_score']
+    return np.where(score_diff > 0, 1.0, np.where(score_diff < 0, 0.0, 0.5))
+
+def replay_predictions(matches, k_factor, initial_rating, margin_scale, split, chunk_size=4096):
+    # Ratings are a list indexed by team number. Rows are pulled from the
+    # shared array a chunk at a time, so no worker holds a copy of the whole
+    # history. Each prediction is made before its match is applied
+    if not len(matches):
+        return np.empty(0)
+    team_limit = int(max(matches['red_alliance'].max(), matches['blue_alliance'].max())) + 1
+    ratings = [initial_rating] * team_limit
+    predictions = np.empty(len(matches))
+    for start in range(0, len(matches), chunk_size):
+        chunk = matches[start:start + chunk_size]
+        rows = zip(
+            chunk['red_alliance'].tolist(),
+            chunk['blue_alliance'].tolist(),
+            chunk['red_score'].tolist(),
+            chunk['blue_score'].tolist()
+        )
+        for i, ((r1, r2, r3), (b1, b2, b3), red_score, blue_score) in enumerate(rows, start):
+            red_rating = ratings[r1] + ratings[r2] + ratings[r3]
+            blue_rating = ratings[b1] + ratings[b2] + ratings[b3]
+            predictions[i] = 1 / (1 + 10 ** ((blue_rating - red_rating) / 400))
+
+            if red_score > blue_score:
+                change = rating_change(red_rating, blue_rating, red_score - blue_score, k_factor, margin_scale, split)
+            elif blue_score > red_score:
+                change = -rating_change(blue_rating, red_rating, blue_score - red_score, k_factor, margin_scale, split)
+            else:
+                continue
+            ratings[r1] += change
+            ratings[r2] += change
+            ratings[r3] += change
+            ratings[b1] -= change
+            ratings[b2] -= change
+            ratings[b3] -= change
+    return predictions
+
+def calibration_scores(predictions, outcomes):
+    clipped = np.clip(predictions, 1e-12, 1 - 1e-12)
+    decided = outcomes != 0.5
+    return {
+        'brier': float(np.mean((predictions - outcomes) ** 2)),
+        'log_loss': float(-np.mean(outcomes * np.log(clipped) + (1 - outcomes) * np.log(1 - clipped))),
+        'accuracy': float(np.mean((predictions[decided] > 0.5) == (outcomes[decided] == 1))) if decided.any() else None
+    }
+
+def score_config(config, warmup=0):
+    predictions = replay_predictions(_history, **config)
+    scores = calibration_scores(predictions[warmup:], match_outcomes(_history[warmup:]))
+    return {**config, **scores}
+
+def grid_configs(grid):
+    return [dict(zip(PARAMETERS, values)) for values in itertools.product(*(grid[name] for name in PARAMETERS))]
+
+def random_configs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {name: float(rng.uniform(*RANDOM_RANGES[name])) for name in PARAMETERS}
+        for _ in range(count)
+    ]
+
+def sweep(path, configs, warmup=0, workers=None):
+    workers = max(1, min(workers or os.cpu_count() or 1, len(configs)))
+    # Build the cache up front so workers only ever memory-map it
+    match_count = len(load_matches(path))
+    if not match_count:
+        raise ValueError(f"No matches in {path}")
+    if not 0 <= warmup < match_count:
+        raise ValueError(f"Warmup must be between 0 and {match_count - 1} for {match_count} matches")
+    if workers == 1:
+        _load_history(path)
+        return [score_config(config, warmup) for config in configs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load_history, initargs=(path,)) as pool:
+        chunksize = max(1, len(configs) // (workers * 8))
+        return list(pool.map(score_config, configs, itertools.repeat(warmup), chunksize=chunksize))
+
+def _sort_key(result, metric):
+    if metric == 'accuracy':
+        # Accuracy is undefined when every scored match was a tie; sort it last
+        return -result['accuracy'] if result['accuracy'] is not None else float('inf')
+    return result[metric]
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep Elo parameters and score one-step-ahead predictions')
+    parser.add_argument('matches', nargs='?', default='match_data.jsonl')
+    parser.add_argument('--k-factor', type=float, nargs='+', default=[8, 16, 24, 32, 48, 64])
+    parser.add_argument('--initial-rating', type=float, nargs='+', default=[1500])
+    parser.add_argument('--margin-scale', type=float, nargs='+', default=[50, 100, 200, 400])
+    parser.add_argument('--split', type=float, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--random', type=int, help='sample this many random configurations instead of the grid')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=int, default=0, help='matches to replay before scoring starts')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sort', choices=['brier', 'log_loss', 'accuracy'], default='log_loss')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', help='write every scored configuration as JSON')
+    args = parser.parse_args()
+
+    if args.random:
+        configs = random_configs(args.random, args.seed)
+    else:
+        configs = grid_configs({
+            'k_factor': args.k_factor,
+            'initial_rating': args.initial_rating,
+            'margin_scale': args.margin_scale,
+            'split': args.split
+        })
+
+    try:
+        results = sweep(args.matches, configs, args.warmup, args.workers)
+    except ValueError as e:
+        print(f"Error scoring configurations: {e}")
+        return
+    results.sort(key=lambda result: _sort_key(result, args.sort))
+
+    print(f"{'K':>7} {'Initial':>8} {'Margin':>7} {'Split':>6} {'Brier':>7} {'LogLoss':>8} {'Accuracy':>9}")
+    for result in results[:args.top]:
+        accuracy = f"{result['accuracy']:>9.2%}" if result['accuracy'] is not None else f"{'-':>9}"
+        print(f"{result['k_factor']:>7.1f} {result['initial_rating']:>8.0f} {result['margin_scale']:>7.1f} "
+              f"{result['split']:>6.2f} {result['brier']:>7.4f} {result['log_loss']:>8.4f} {accuracy}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()